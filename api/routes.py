@@ -2,32 +2,62 @@
 API routes for music generation
 """
 import logging
-import os
-from flask import Blueprint, request, jsonify, current_app, send_file
+from flask import Blueprint, request, jsonify, current_app
 from services.model_loader import ModelLoader
 from services.validator import InputValidator
 from services.generator import MusicGenerator
+from config.logging_config import DEBUG_MODE
 
 logger = logging.getLogger(__name__)
 
 api_bp = Blueprint('api', __name__)
 
 # Initialize services
-model_loader = None
 validator = InputValidator()
-generator = None
 
-def init_services():
-    """Initialize services on first request"""
-    global model_loader, generator
-    if model_loader is None:
-        model_loader = ModelLoader(current_app.config['MODEL_PATH'])
-        generator = MusicGenerator(model_loader)
 
-@api_bp.before_request
-def before_request():
-    """Initialize services before first request"""
-    init_services()
+def _run_blocking(func, *args):
+    """
+    Run CPU-bound work without stalling the worker
+    
+    Under gunicorn's gevent workers threads are monkey-patched into greenlets,
+    so the work is sent to gevent's pool of real OS threads and only the
+    calling greenlet waits; other requests keep being served by the hub.
+    Elsewhere (dev server, sync workers, tests) the call runs inline.
+    
+    Args:
+        func: Callable to run
+        args: Positional arguments for func
+    
+    Returns:
+        The return value of func
+    """
+    try:
+        from gevent import get_hub
+        from gevent.monkey import is_module_patched
+    except ImportError:
+        return func(*args)
+    
+    if not is_module_patched('threading'):
+        return func(*args)
+    return get_hub().threadpool.spawn(func, *args).get()
+
+def init_app(app):
+    """
+    Load the model and create the generation services at startup
+    
+    Args:
+        app: Flask application; services are stored on app.extensions['music']
+    """
+    model_loader = ModelLoader(
+        app.config['MODEL_PATH'],
+        precision=app.config.get('MODEL_PRECISION', 'int8'),
+        compile_model=app.config.get('MODEL_COMPILE', False)
+    )
+    app.extensions['music'] = {
+        'model_loader': model_loader,
+        'generator': MusicGenerator(model_loader)
+    }
 
 @api_bp.route('/generate', methods=['POST'])
 def generate():
@@ -57,38 +87,40 @@ def generate():
         
         # Validate input
         validation_result = validator.validate(data)
-        if not validation_result['valid']:
-            logger.warning(f'Invalid input: {validation_result["errors"]}')
-            return jsonify({'error': validation_result['errors']}), 400
+        if not validation_result.valid:
+            logger.warning('Invalid input: %s', validation_result.errors)
+            return jsonify({'error': validation_result.errors}), 400
         
         # Extract validated parameters
-        seed = validation_result['data']['seed']
-        temperature = validation_result['data']['temperature']
-        length = validation_result['data']['length']
+        seed = validation_result.data['seed']
+        temperature = validation_result.data['temperature']
+        length = validation_result.data['length']
         
-        logger.info(f'Generating music with seed="{seed}", temp={temperature}, len={length}')
+        logger.info('Generating music with seed="%s", temp=%s, len=%s', seed, temperature, length)
         
-        # Generate music
-        result = generator.generate(seed, temperature, length)
+        # Generate music on an OS thread so the gevent hub keeps serving other requests
+        generator = current_app.extensions['music']['generator']
+        result = _run_blocking(generator.generate, seed, temperature, length)
         
         logger.info('Music generation successful')
         return jsonify(result), 200
         
     except Exception as e:
-        logger.error(f'Generation error: {str(e)}', exc_info=True)
+        logger.error('Generation error: %s', e, exc_info=DEBUG_MODE)
         return jsonify({'error': 'Generation failed', 'details': str(e)}), 500
 
 @api_bp.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
     try:
+        model_loader = current_app.extensions.get('music', {}).get('model_loader')
         model_loaded = model_loader is not None and model_loader.model is not None
         return jsonify({
             'status': 'ok',
             'model_loaded': model_loaded
         }), 200
     except Exception as e:
-        logger.error(f'Health check error: {str(e)}')
+        logger.error('Health check error: %s', e)
         return jsonify({
             'status': 'error',
             'model_loaded': False
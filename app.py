@@ -4,7 +4,9 @@ Main entry point for the web application
 """
 import os
 import logging
+import orjson
 from flask import Flask, render_template, jsonify, request
+from flask.json.provider import JSONProvider
 from dotenv import load_dotenv
 from config.logging_config import setup_logging
 
@@ -15,20 +17,47 @@ load_dotenv()
 setup_logging()
 logger = logging.getLogger(__name__)
 
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson for jsonify() and request.get_json()"""
+
+    OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        option = self.OPTIONS
+        if kwargs.get('sort_keys'):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.OPTIONS), mimetype='application/json')
+
+
 # Create Flask app
 app = Flask(__name__, template_folder='templates', static_folder='static')
+app.json = OrjsonProvider(app)
 
 # Configuration from environment variables
 app.config['MODEL_PATH'] = os.getenv('MODEL_PATH', 'best_model.pt')
+app.config['MODEL_PRECISION'] = os.getenv('MODEL_PRECISION', 'int8').lower()
+app.config['MODEL_COMPILE'] = os.getenv('MODEL_COMPILE', 'False').lower() == 'true'
 app.config['DEBUG'] = os.getenv('DEBUG', 'False').lower() == 'true'
 app.config['PORT'] = int(os.getenv('PORT', 5000))
 
 # Import blueprints
-from api.routes import api_bp
+from api.routes import api_bp, init_app
 
 # Register blueprints
 app.register_blueprint(api_bp, url_prefix='/api')
 
+# Load the model and services once at startup
+init_app(app)
+
 @app.route('/')
 def index():
     """Render the main application page"""
@@ -47,11 +76,11 @@ def not_found(error):
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
-    logger.error(f'Internal server error: {error}')
+    logger.error('Internal server error: %s', error)
     return jsonify({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
-    logger.info(f'Starting Music Generation GUI on port {app.config["PORT"]}')
+    logger.info('Starting Music Generation GUI on port %d', app.config['PORT'])
     app.run(
         host='0.0.0.0',
         port=app.config['PORT'],
@@ -1,19 +1,23 @@
 """
 Logging configuration for Music Generation GUI
 """
+import atexit
+import copy
 import logging
 import logging.handlers
 import os
+import queue
 from datetime import datetime
+import orjson
 
-# Create logs directory if it doesn't exist
 LOGS_DIR = 'logs'
-if not os.path.exists(LOGS_DIR):
-    os.makedirs(LOGS_DIR)
 
 # Determine if running in production or development
 DEBUG_MODE = os.getenv('DEBUG', 'False').lower() == 'true'
 
+# File logging is opt-in; containers log to stdout/stderr only
+LOG_TO_FILE = os.getenv('LOG_TO_FILE', 'False').lower() == 'true'
+
 # Log file paths
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 GENERAL_LOG = os.path.join(LOGS_DIR, 'app.log')
@@ -21,6 +25,52 @@ ERROR_LOG = os.path.join(LOGS_DIR, 'errors.log')
 REQUEST_LOG = os.path.join(LOGS_DIR, 'requests.log')
 
 
+class JsonFormatter(logging.Formatter):
+    """Formats log records as single-line JSON objects"""
+    
+    def format(self, record):
+        entry = {
+            'ts': record.created,
+            'lvl': record.levelname,
+            'name': record.name,
+            'msg': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode('utf-8')
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting, tracebacks included, to the listener's handlers"""
+    
+    def prepare(self, record):
+        # The stock prepare() pre-formats the record and drops exc_info, so
+        # JsonFormatter would never see the exception; only merge the args
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _attach_queue_listener(logger, *handlers):
+    """
+    Route a logger's records through a queue drained by a background thread
+    
+    Args:
+        logger: Logger that receives the QueueHandler
+        handlers: Handlers the listener thread writes to
+    
+    Returns:
+        The started QueueListener
+    """
+    log_queue = queue.Queue(-1)
+    logger.addHandler(_RecordQueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
 def setup_logging():
     """Configure logging for the application"""
     
@@ -29,10 +79,7 @@ def setup_logging():
     root_logger.setLevel(getattr(logging, LOG_LEVEL))
     
     # Create formatters
-    detailed_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    json_formatter = JsonFormatter()
     
     simple_formatter = logging.Formatter(
         '%(levelname)s - %(message)s'
@@ -42,39 +89,48 @@ def setup_logging():
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO if not DEBUG_MODE else logging.DEBUG)
     console_handler.setFormatter(simple_formatter)
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
     
-    # General log file handler
-    general_handler = logging.handlers.RotatingFileHandler(
-        GENERAL_LOG,
-        maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
-    )
-    general_handler.setLevel(getattr(logging, LOG_LEVEL))
-    general_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(general_handler)
+    if LOG_TO_FILE:
+        # Create logs directory if it doesn't exist
+        if not os.path.exists(LOGS_DIR):
+            os.makedirs(LOGS_DIR)
+        
+        # General log file handler
+        general_handler = logging.handlers.RotatingFileHandler(
+            GENERAL_LOG,
+            maxBytes=10 * 1024 * 1024,  # 10MB
+            backupCount=5
+        )
+        general_handler.setLevel(getattr(logging, LOG_LEVEL))
+        general_handler.setFormatter(json_formatter)
+        handlers.append(general_handler)
+        
+        # Error log file handler
+        error_handler = logging.handlers.RotatingFileHandler(
+            ERROR_LOG,
+            maxBytes=10 * 1024 * 1024,  # 10MB
+            backupCount=5
+        )
+        error_handler.setLevel(logging.ERROR)
+        error_handler.setFormatter(json_formatter)
+        handlers.append(error_handler)
     
-    # Error log file handler
-    error_handler = logging.handlers.RotatingFileHandler(
-        ERROR_LOG,
-        maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
-    )
-    error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(error_handler)
+    # Writes happen on a listener thread so request threads only enqueue records
+    _attach_queue_listener(root_logger, *handlers)
     
-    # Request log file handler
-    request_logger = logging.getLogger('requests')
-    request_handler = logging.handlers.RotatingFileHandler(
-        REQUEST_LOG,
-        maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
-    )
-    request_handler.setLevel(logging.INFO)
-    request_handler.setFormatter(detailed_formatter)
-    request_logger.addHandler(request_handler)
-    request_logger.propagate = False
+    if LOG_TO_FILE:
+        # Request log file handler
+        request_logger = logging.getLogger('requests')
+        request_handler = logging.handlers.RotatingFileHandler(
+            REQUEST_LOG,
+            maxBytes=10 * 1024 * 1024,  # 10MB
+            backupCount=5
+        )
+        request_handler.setLevel(logging.INFO)
+        request_handler.setFormatter(json_formatter)
+        _attach_queue_listener(request_logger, request_handler)
+        request_logger.propagate = False
     
     return root_logger
 
@@ -87,12 +143,12 @@ def get_request_logger():
 def log_request(method, path, status_code, duration_ms):
     """Log an HTTP request"""
     logger = get_request_logger()
-    logger.info(f'{method} {path} - {status_code} ({duration_ms}ms)')
+    logger.info('%s %s - %s (%sms)', method, path, status_code, duration_ms)
 
 
 def log_error(error_type, error_message, stack_trace=None):
     """Log an error with context"""
     logger = logging.getLogger()
-    logger.error(f'{error_type}: {error_message}')
+    logger.error('%s: %s', error_type, error_message)
     if stack_trace:
-        logger.error(f'Stack trace: {stack_trace}')
+        logger.error('Stack trace: %s', stack_trace)
@@ -5,9 +5,25 @@ import logging
 from datetime import datetime, timezone
 import torch
 import numpy as np
+from config.logging_config import DEBUG_MODE
 
 logger = logging.getLogger(__name__)
 
+# Common ABC notation characters making up the generator vocabulary
+VOCAB_CHARS = frozenset('ABCDEFGabcdefgz|:[]()\',-/0123456789\nMKLTXtCQPVwHhOu+.~!$&*;?@%^_`')
+
+# Characters the generator is allowed to emit
+VALID_CHARS = frozenset('ABCDEFGabcdefgz|:[]()\',-/0123456789\nMKLTXtCQPVwHhOu+.~!*;?@%^_`')
+
+# str.translate table that deletes valid characters, used to count them in C
+_DELETE_VALID_CHARS = str.maketrans('', '', ''.join(VALID_CHARS))
+
+# ABC header used as the RNN seed and prepended to headerless output
+ABC_HEADER = "X:1\nT:Generated\nM:4/4\nL:1/8\nK:Emin\n"
+
+# UTC timestamp format for generation results (ISO 8601 with a literal Z)
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
 class MusicGenerator:
     """Generates music using the trained RNN model"""
     
@@ -21,14 +37,63 @@ class MusicGenerator:
         self.model_loader = model_loader
         self.char_to_idx = None
         self.idx_to_char = None
+        self._char_lut = None
+        self._header_indices = None
+        self._valid_idx_mask_cpu = None
+        self._valid_idx_mask = None
         self._build_vocab()
     
     def _build_vocab(self):
         """Build character vocabulary from ABC notation"""
-        # Common ABC notation characters
-        chars = set('ABCDEFGabcdefgz|:[]()\',-/0123456789\nMKLTXtCQPVwHhOu+.~!$&*;?@%^_`')
-        self.char_to_idx = {char: idx for idx, char in enumerate(sorted(chars))}
+        self.char_to_idx = {char: idx for idx, char in enumerate(sorted(VOCAB_CHARS))}
         self.idx_to_char = {idx: char for char, idx in self.char_to_idx.items()}
+        
+        # Byte-indexed lookup table; unknown characters map to index 0
+        self._char_lut = np.zeros(256, dtype=np.int64)
+        for char, idx in self.char_to_idx.items():
+            self._char_lut[ord(char)] = idx
+        
+        # The seed header never changes, so its token indices are computed once
+        self._header_indices = self._encode(ABC_HEADER)
+        
+        self._valid_idx_mask_cpu = np.array(
+            [self.idx_to_char[idx] in VALID_CHARS for idx in range(len(self.idx_to_char))],
+            dtype=np.bool_
+        )
+    
+    def _encode(self, text):
+        """
+        Convert text to token indices with a single vectorized lookup
+        
+        Args:
+            text: Text to encode
+        
+        Returns:
+            int64 NumPy array of token indices
+        """
+        codes = np.frombuffer(text.encode('latin-1', errors='replace'), dtype=np.uint8)
+        return self._char_lut[codes]
+    
+    def _get_valid_idx_mask(self, vocab_size):
+        """
+        Get a boolean mask over model output indices that map to valid characters
+        
+        Indices beyond the generator vocabulary are marked invalid. The mask is
+        cached on the instance and rebuilt only if the output size changes.
+        
+        Args:
+            vocab_size: Size of the model's output layer
+        
+        Returns:
+            Boolean NumPy array of shape (vocab_size,)
+        """
+        mask = self._valid_idx_mask
+        if mask is None or mask.shape[0] != vocab_size:
+            mask = np.zeros(vocab_size, dtype=np.bool_)
+            known = min(vocab_size, self._valid_idx_mask_cpu.shape[0])
+            mask[:known] = self._valid_idx_mask_cpu[:known]
+            self._valid_idx_mask = mask
+        return mask
     
     def generate(self, seed, temperature, length):
         """
@@ -48,7 +113,7 @@ class MusicGenerator:
             # Generate music using the model
             notation = self._generate_with_model(seed, temperature, length, model)
             
-            timestamp = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+            timestamp = datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
             
             return {
                 'notation': notation,
@@ -61,7 +126,7 @@ class MusicGenerator:
             }
             
         except Exception as e:
-            logger.error(f'Generation failed: {str(e)}', exc_info=True)
+            logger.error('Generation failed: %s', e, exc_info=DEBUG_MODE)
             raise
     
     def _generate_with_model(self, seed, temperature, length, model):
@@ -79,211 +144,173 @@ class MusicGenerator:
         """
         # If seed is empty, use ABC header as seed
         if not seed or seed.strip() == '':
-            seed = "X:1\nT:Generated\nM:4/4\nL:1/8\nK:Emin\n"
+            seed = ABC_HEADER
         
         try:
             # Try to use the actual model
             logger.info('Attempting to generate with RNN model...')
-            notation = self._generate_with_rnn(seed, temperature, length, model)
+            notation, valid_count = self._generate_with_rnn(seed, temperature, length, model)
             
             # Check if output looks reasonable (has some valid ABC characters)
-            valid_chars = set('ABCDEFGabcdefgz|:[]()\',-/0123456789\nMKLTXtCQPVwHhOu+.~!*;?@%^_`')
-            valid_count = sum(1 for c in notation if c in valid_chars)
-            
             if valid_count < len(notation) * 0.3:
                 # Less than 30% valid characters, fall back to random
-                logger.warning(f'Model output quality low ({valid_count}/{len(notation)} valid chars), using fallback')
+                logger.warning('Model output quality low (%d/%d valid chars), using fallback', valid_count, len(notation))
                 notation = self._generate_random(seed, temperature, length)
             else:
-                logger.info(f'Model output quality good ({valid_count}/{len(notation)} valid chars)')
+                logger.info('Model output quality good (%d/%d valid chars)', valid_count, len(notation))
             
             # Ensure proper ABC format
             if not notation.startswith('X:'):
-                notation = "X:1\nT:Generated\nM:4/4\nL:1/8\nK:Emin\n" + notation
+                notation = ABC_HEADER + notation
             
-            logger.info(f'Successfully generated {len(notation)} characters')
+            logger.info('Successfully generated %d characters', len(notation))
             return notation[:length] if len(notation) > length else notation
             
         except Exception as e:
-            logger.warning(f'RNN model generation failed: {e}', exc_info=True)
+            logger.warning('RNN model generation failed: %s', e, exc_info=DEBUG_MODE)
             logger.info('Falling back to random generation...')
             # Fallback to random generation
             notation = self._generate_random(seed, temperature, length)
             return notation
     
     def _generate_with_rnn(self, seed, temperature, length, model):
-        """Generate using the RNN model with improved quality"""
+        """Generate using the RNN model, returning (notation, valid_count)"""
         try:
             # Get device from model parameters
             device = next(model.parameters()).device
-            model.eval()
             
             # Prepare seed - use ABC notation header
-            seed_text = "X:1\nT:Generated\nM:4/4\nL:1/8\nK:Emin\n"
+            seed_text = ABC_HEADER
             
-            # Generate sequence
-            generated = seed_text
+            # Generate sequence; characters accumulate in a list joined once at the end
+            generated = list(seed_text)
+            # Sampled characters are always valid, so only the header needs a scan
+            valid_count = len(seed_text) - len(seed_text.translate(_DELETE_VALID_CHARS))
             max_iterations = max(150, length // 2)
+            rng = np.random.default_rng()
             
-            # Track what characters we've seen to filter invalid ones
-            valid_chars = set('ABCDEFGabcdefgz|:[]()\',-/0123456789\nMKLTXtCQPVwHhOu+.~!*;?@%^_`')
-            
-            with torch.no_grad():
+            with torch.inference_mode():
+                # Encode the seed once; afterwards only the newest character is fed
+                # to the model together with the carried LSTM hidden state
+                input_seq = torch.from_numpy(self._header_indices).unsqueeze(0).to(device)
+                last_logits, hidden = self._forward_last(model, input_seq, None)
+                
                 for iteration in range(max_iterations):
-                    # Get last 50 characters for context
-                    context = generated[-50:] if len(generated) > 50 else generated
-                    
-                    # Convert to tensor
                     try:
-                        input_indices = [self.char_to_idx.get(c, 0) for c in context]
-                        input_seq = torch.tensor(input_indices, dtype=torch.long).unsqueeze(0).to(device)
-                        
-                        # Get model output
-                        output = model(input_seq)
-                        
-                        # Handle different output formats
-                        if isinstance(output, tuple):
-                            logits = output[0]
-                        else:
-                            logits = output
-                        
-                        # Get last token logits
-                        if len(logits.shape) == 3:
-                            last_logits = logits[:, -1, :]
-                        else:
-                            last_logits = logits
-                        
-                        # Apply temperature scaling
-                        scaled_logits = last_logits / max(temperature, 0.1)
-                        
-                        # Get probabilities
-                        probs = torch.softmax(scaled_logits, dim=-1)
-                        
-                        # Get top candidates
-                        top_k = min(20, probs.shape[-1])
-                        top_probs, top_indices = torch.topk(probs[0], top_k)
+                        # Get top candidates straight from the logits; a softmax over
+                        # the top-k equals the full softmax renormalized over them
+                        top_k = min(20, last_logits.shape[-1])
+                        top_indices = np.argpartition(last_logits, -top_k)[-top_k:]
                         
                         # Filter for valid characters and resample
-                        valid_mask = torch.tensor([self.idx_to_char.get(idx.item(), '') in valid_chars 
-                                                   for idx in top_indices], device=device)
-                        
-                        if valid_mask.any():
-                            # Keep only valid characters
-                            valid_probs = top_probs[valid_mask]
-                            valid_indices = top_indices[valid_mask]
-                            valid_probs = valid_probs / valid_probs.sum()
-                            
-                            # Sample from valid characters
-                            next_idx_in_valid = torch.multinomial(valid_probs, 1).item()
-                            next_idx = valid_indices[next_idx_in_valid].item()
-                        else:
+                        candidates = top_indices[self._get_valid_idx_mask(last_logits.shape[-1])[top_indices]]
+                        if candidates.size == 0:
                             # Fallback: sample from all
-                            next_idx = torch.multinomial(probs[0], 1).item()
+                            candidates = np.arange(last_logits.shape[-1])
                         
-                        next_char = self.idx_to_char.get(next_idx, 'C')
+                        # Apply temperature scaling and softmax over the candidates only
+                        scaled_logits = last_logits[candidates] / max(temperature, 0.1)
+                        weights = np.exp(scaled_logits - scaled_logits.max())
+                        next_idx = int(candidates[self._sample_index(weights, rng)])
                         
-                        # Only add valid characters
-                        if next_char in valid_chars:
-                            generated += next_char
+                        next_char = self.idx_to_char.get(next_idx, 'C')
                         
-                        # Stop if we've generated enough
-                        if len(generated) >= length:
-                            break
+                        # Only add valid characters; rejected samples are redrawn
+                        # from the same logits since the context did not change
+                        if next_char in VALID_CHARS:
+                            generated.append(next_char)
+                            valid_count += 1
+                            
+                            # Stop if we've generated enough
+                            if len(generated) >= length:
+                                break
+                            
+                            input_seq = torch.tensor([[next_idx]], dtype=torch.long, device=device)
+                            last_logits, hidden = self._forward_last(model, input_seq, hidden)
                             
                     except Exception as e:
-                        logger.warning(f'Model inference iteration {iteration} failed: {e}')
+                        logger.warning('Model inference iteration %d failed: %s', iteration, e)
                         break
             
-            logger.info(f'Generated {len(generated)} characters using RNN model')
-            return generated
+            logger.info('Generated %d characters using RNN model', len(generated))
+            return ''.join(generated), valid_count
             
         except Exception as e:
-            logger.error(f'RNN generation failed: {e}', exc_info=True)
+            logger.error('RNN generation failed: %s', e, exc_info=DEBUG_MODE)
             raise
     
+    def _sample_index(self, probs, rng):
+        """
+        Draw an index in proportion to unnormalized probabilities
+        
+        Args:
+            probs: 1-D array of non-negative weights
+            rng: NumPy random Generator
+        
+        Returns:
+            Sampled position in probs
+        """
+        cdf = np.cumsum(probs, dtype=np.float64)
+        idx = int(np.searchsorted(cdf, rng.random() * cdf[-1], side='right'))
+        return min(idx, len(probs) - 1)
+    
+    def _forward_last(self, model, input_seq, hidden):
+        """
+        Run the model and keep only the logits for the last position
+        
+        Args:
+            model: The trained RNN model
+            input_seq: Token indices of shape (1, seq_len)
+            hidden: LSTM (h, c) state from the previous call, or None
+        
+        Returns:
+            Tuple of (last-position logits as a float32 NumPy array of shape
+            (vocab_size,), new hidden state)
+        """
+        logits, hidden = model(input_seq, hidden)
+        
+        # Get last token logits; sampling happens on the CPU with a single
+        # device-to-host copy per forward pass
+        if len(logits.shape) == 3:
+            logits = logits[:, -1, :]
+        return logits[0].float().cpu().numpy(), hidden
+    
     def _generate_random(self, seed, temperature, length):
         """Generate proper ABC notation with chord annotations matching user examples"""
-        import random
+        rng = np.random.default_rng()
         
         # Proper ABC notation header - matching user's example format
-        notation = "X:1\n"
-        notation += "T:Generated Tune\n"
-        notation += "M:4/4\n"
-        notation += "L:1/8\n"
-        notation += "R:reel\n"
-        notation += "K:Emin\n"
+        parts = ["X:1\nT:Generated Tune\nM:4/4\nL:1/8\nR:reel\nK:Emin\n"]
         
         # Available notes for Irish folk music (Em key)
-        notes = ['D', 'E', 'F', 'G', 'A', 'B', 'c', 'd', 'e', 'f', 'g', 'a', 'b']
-        
-        # Chord progression (Em and D are common in Irish reels)
-        chords = ['Em', 'D']
-        current_chord = 'Em'
-        chord_bar_count = 0
-        
-        # Generate note sequence with proper structure
-        bar_count = 0
-        notes_in_bar = 0
-        current_line = ""
+        notes = np.array(['D', 'E', 'F', 'G', 'A', 'B', 'c', 'd', 'e', 'f', 'g', 'a', 'b'])
         
         # Generate enough bars (typically 8-16 bars for a tune)
         target_bars = max(8, min(16, length // 20))
         
-        # Start with repeat sign and first chord
-        current_line = "|: \"Em\""
+        # Draw every random decision for all bars at once, 4 notes per bar
+        # (4/4 time with 1/8 note default)
+        shape = (target_bars, 4)
         
-        while bar_count < target_bars:
-            # Change chord every 2 bars
-            if chord_bar_count >= 2:
-                current_chord = random.choice(chords)
-                chord_bar_count = 0
-            
-            # Generate 4 notes per bar (for 4/4 time with 1/8 note default)
-            for note_idx in range(4):
-                # Select note based on temperature
-                if random.random() < (1.0 - temperature / 2.5):
-                    # Pick from common notes (lower range) - more deterministic
-                    note = random.choice(notes[:8])
-                else:
-                    # Pick any note - more creative
-                    note = random.choice(notes)
-                
-                # Add duration modifier (less frequently)
-                duration_roll = random.random()
-                if duration_roll < 0.05:
-                    note += "4"  # Half note
-                elif duration_roll < 0.1:
-                    note += "2"  # Quarter note
-                # else: default 1/8 note
-                
-                current_line += note
-                
-                # Add space between notes
-                if note_idx < 3:
-                    current_line += " "
-                
-                notes_in_bar += 1
-            
-            # Add bar line
-            current_line += "|"
-            bar_count += 1
-            chord_bar_count += 1
-            notes_in_bar = 0
-            
-            # Add chord annotation for next bar if needed
-            if bar_count < target_bars and chord_bar_count == 0:
-                current_line += f" \"{current_chord}\""
-            
-            # Add line break every 2 bars for readability
-            if bar_count % 2 == 0:
-                notation += current_line + "\n"
-                current_line = ""
+        # Select note based on temperature: common notes (lower range) are more
+        # deterministic, any note is more creative
+        pick_common = rng.random(shape) < (1.0 - temperature / 2.5)
+        note_idx = np.where(pick_common, rng.integers(0, 8, shape), rng.integers(0, len(notes), shape))
+        
+        # Add duration modifier (less frequently): half note, quarter note or default 1/8
+        duration_roll = rng.random(shape)
+        durations = np.where(duration_roll < 0.05, '4', np.where(duration_roll < 0.1, '2', ''))
+        
+        tokens = np.char.add(notes[note_idx], durations).tolist()
+        bars = [' '.join(bar) + '|' for bar in tokens]
         
-        # Add any remaining content
-        if current_line:
-            notation += current_line + "\n"
+        # Start with repeat sign and first chord, line break every 2 bars for readability
+        bars[0] = "|: \"Em\"" + bars[0]
+        for i in range(0, target_bars, 2):
+            parts.append(''.join(bars[i:i + 2]))
+            parts.append('\n')
         
         # Close the repeat with proper ending
-        notation += ":|"
+        parts.append(":|")
         
-        return notation
+        return ''.join(parts)
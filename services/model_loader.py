@@ -1,10 +1,13 @@
 """
 Model loader service for loading and caching the RNN model
 """
+import copy
 import logging
 import torch
 import torch.nn as nn
 import os
+from typing import Optional, Tuple
+from services.generator import ABC_HEADER
 
 logger = logging.getLogger(__name__)
 
@@ -20,23 +23,32 @@ class CharRNN(nn.Module):
         self.rnn = nn.LSTM(128, hidden_size, num_layers, batch_first=True, dropout=0.2)
         self.fc = nn.Linear(hidden_size, vocab_size)
     
-    def forward(self, x):
+    def forward(self, x, hidden: Optional[Tuple[torch.Tensor, torch.Tensor]] = None):
         embedded = self.embedding(x)
-        rnn_out, _ = self.rnn(embedded)
+        rnn_out, hidden = self.rnn(embedded, hidden)
         logits = self.fc(rnn_out)
-        return logits
+        return logits, hidden
 
 class ModelLoader:
     """Loads and caches the RNN model"""
     
-    def __init__(self, model_path):
+    # Supported inference precisions
+    PRECISIONS = ('fp32', 'int8', 'int4', 'bf16')
+    
+    def __init__(self, model_path, precision='int8', compile_model=False):
         """
         Initialize the model loader
         
         Args:
             model_path: Path to the model file (best_model.pt)
+            precision: Inference precision, one of PRECISIONS
+            compile_model: Compile the model with torch.compile after loading
         """
+        if precision not in self.PRECISIONS:
+            raise ValueError(f'Unsupported precision: {precision} (expected one of {", ".join(self.PRECISIONS)})')
         self.model_path = model_path
+        self.precision = precision
+        self.compile_model = compile_model
         self.model = None
         self._load_model()
     
@@ -46,8 +58,8 @@ class ModelLoader:
             if not os.path.exists(self.model_path):
                 raise FileNotFoundError(f'Model file not found: {self.model_path}')
             
-            logger.info(f'Loading model from {self.model_path}')
-            loaded_data = torch.load(self.model_path, map_location='cpu')
+            logger.info('Loading model from %s', self.model_path)
+            loaded_data = self._read_checkpoint()
             
             # Check if it's a state dict or a full model
             if isinstance(loaded_data, dict):
@@ -69,10 +81,12 @@ class ModelLoader:
                     hidden_size = 256
                     num_layers = 2
                 
-                # Create model and load state
-                self.model = CharRNN(vocab_size, hidden_size, num_layers)
-                self.model.load_state_dict(state_dict)
-                logger.info(f'Loaded model state dict (vocab_size={vocab_size}, hidden_size={hidden_size})')
+                # Create model on the meta device and adopt the loaded tensors,
+                # so no throwaway FP32 weights are allocated first
+                with torch.device('meta'):
+                    self.model = CharRNN(vocab_size, hidden_size, num_layers)
+                self.model.load_state_dict(state_dict, assign=True)
+                logger.info('Loaded model state dict (vocab_size=%s, hidden_size=%s)', vocab_size, hidden_size)
             else:
                 # It's a full model object
                 self.model = loaded_data
@@ -82,12 +96,171 @@ class ModelLoader:
             if hasattr(self.model, 'eval'):
                 self.model.eval()
             
+            if isinstance(self.model, nn.Module):
+                if self.precision == 'int8':
+                    self.model = self._quantize(self.model)
+                elif self.precision == 'int4':
+                    self.model = self._quantize_int4(self.model)
+                elif self.precision == 'bf16':
+                    self.model = self._to_bfloat16(self.model)
+                if self.compile_model:
+                    self.model = self._compile(self.model)
+            
             logger.info('Model loaded successfully')
             
         except Exception as e:
-            logger.error(f'Failed to load model: {str(e)}')
+            logger.error('Failed to load model: %s', e)
             raise
     
+    def _read_checkpoint(self):
+        """
+        Read the checkpoint with memory-mapped, weights-only loading
+        
+        Tensor storage is mapped from the file instead of read eagerly. Files
+        that need full unpickling (whole model objects) or use the legacy
+        non-zip format are loaded the regular way.
+        
+        Returns:
+            The object stored in the checkpoint
+        """
+        try:
+            return torch.load(self.model_path, map_location='cpu', mmap=True, weights_only=True)
+        except Exception as e:
+            logger.info('Memory-mapped weights-only load unavailable, loading eagerly: %s', e)
+            return torch.load(self.model_path, map_location='cpu', weights_only=False)
+    
+    def _quantize(self, model):
+        """
+        Apply INT8 dynamic quantization to the LSTM and Linear layers
+        
+        The embedding stays in FP32. Falls back to the unquantized model if
+        no quantized engine is available on this platform.
+        
+        Args:
+            model: Model in eval mode
+        
+        Returns:
+            The quantized model, or the original model on failure
+        """
+        try:
+            quantized = torch.ao.quantization.quantize_dynamic(
+                model, {nn.LSTM, nn.Linear}, dtype=torch.qint8
+            )
+            logger.info('Applied INT8 dynamic quantization to LSTM and Linear layers')
+            return quantized
+        except Exception as e:
+            logger.warning('INT8 quantization unavailable, using FP32 model: %s', e)
+            return model
+    
+    def _quantize_int4(self, model):
+        """
+        Apply INT4 groupwise weight-only quantization to the output projection
+        
+        Only fc is quantized to INT4 (group size 64) with torchao; the LSTM gets
+        INT8 dynamic quantization since INT4 LSTM weights lose too much accuracy.
+        torchao is optional: without it, or if the INT4 kernels are unavailable
+        on this platform, the model is quantized to INT8 instead.
+        
+        Args:
+            model: Model in eval mode
+        
+        Returns:
+            The quantized model
+        """
+        try:
+            from torchao.quantization import quantize_, int4_weight_only
+            
+            quantized = copy.deepcopy(model)
+            quantize_(quantized, int4_weight_only(group_size=64), filter_fn=lambda module, fqn: fqn == 'fc')
+            quantized = torch.ao.quantization.quantize_dynamic(
+                quantized, {nn.LSTM}, dtype=torch.qint8
+            )
+            with torch.inference_mode():
+                quantized(torch.zeros((1, 1), dtype=torch.long))
+            logger.info('Applied INT4 weight-only quantization to fc and INT8 to LSTM')
+            return quantized
+        except Exception as e:
+            logger.warning('INT4 quantization unavailable, using INT8: %s', e)
+            return self._quantize(model)
+    
+    def _to_bfloat16(self, model):
+        """
+        Convert the model weights to bfloat16
+        
+        Runs a single-token forward pass to check that the platform supports
+        bfloat16 LSTM kernels, and keeps FP32 otherwise.
+        
+        Args:
+            model: Model in eval mode
+        
+        Returns:
+            The bfloat16 model, or the original model on failure
+        """
+        try:
+            converted = copy.deepcopy(model).to(torch.bfloat16)
+            with torch.inference_mode():
+                converted(torch.zeros((1, 1), dtype=torch.long))
+            logger.info('Converted model weights to bfloat16')
+            return converted
+        except Exception as e:
+            logger.warning('bfloat16 inference unavailable, using FP32 model: %s', e)
+            return model
+    
+    def _compile(self, model):
+        """
+        Compile the model with torch.compile and warm it up like a generation
+        
+        Compilation happens on the first call for each input shape, so the
+        warm-up replays the generator's calls to move that cost to startup and
+        surface backend errors before any request is served. If torch.compile
+        is unavailable, TorchScript is tried instead.
+        
+        Args:
+            model: Model in eval mode
+        
+        Returns:
+            The compiled model, or the original model on failure
+        """
+        try:
+            compiled = torch.compile(model, mode='reduce-overhead', dynamic=False)
+            self._warm_up(compiled)
+            logger.info('Compiled model with torch.compile')
+            return compiled
+        except Exception as e:
+            logger.warning('torch.compile failed, trying TorchScript: %s', e)
+            return self._script(model)
+    
+    def _warm_up(self, model):
+        """
+        Run the same calls MusicGenerator makes: a header prefill without
+        hidden state, then a single-token step that carries it
+        
+        Args:
+            model: Compiled or scripted model
+        """
+        with torch.inference_mode():
+            _, hidden = model(torch.zeros((1, len(ABC_HEADER)), dtype=torch.long), None)
+            model(torch.zeros((1, 1), dtype=torch.long), hidden)
+    
+    def _script(self, model):
+        """
+        Script the model with torch.jit.script and warm it up like a generation
+        
+        Args:
+            model: Model in eval mode
+        
+        Returns:
+            The scripted model, or the original model on failure
+        """
+        try:
+            scripted = torch.jit.script(model)
+            self._warm_up(scripted)
+            logger.info('Scripted model with torch.jit.script')
+            return scripted
+        except Exception as e:
+            logger.warning('TorchScript failed, using eager model: %s', e)
+            return model
+    
     def get_model(self):
         """
         Get the cached model
@@ -3,8 +3,8 @@ Thread-safe request handler for concurrent generation requests
 """
 import logging
 import threading
-from queue import Queue
-from typing import Dict, Any
+from queue import Queue, Empty, Full
+from typing import Dict, Any, List, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -42,13 +42,41 @@ class RequestHandler:
                 self.active_requests[request_id] = 'queued'
                 self.request_counter += 1
             
-            logger.info(f'Request {request_id} queued')
+            logger.info('Request %s queued', request_id)
             return True
             
         except Exception as e:
-            logger.error(f'Failed to queue request: {str(e)}')
+            logger.error('Failed to queue request: %s', e)
             return False
     
+    def queue_requests_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Queue several generation requests under a single lock acquisition
+        
+        Args:
+            items: List of (request_id, request_data) tuples
+        
+        Returns:
+            Number of requests queued; queuing stops at the first one that does not fit
+        """
+        queued = 0
+        
+        with self.lock:
+            for request_id, request_data in items:
+                self.active_requests[request_id] = 'queued'
+                try:
+                    self.request_queue.put_nowait((request_id, request_data))
+                except Full:
+                    del self.active_requests[request_id]
+                    logger.error('Failed to queue request %s: queue is full', request_id)
+                    break
+                queued += 1
+            
+            self.request_counter += queued
+        
+        logger.info('%d requests queued', queued)
+        return queued
+    
     def mark_processing(self, request_id: str) -> None:
         """Mark a request as being processed"""
         with self.lock:
@@ -61,17 +89,34 @@ class RequestHandler:
             if request_id in self.active_requests:
                 del self.active_requests[request_id]
     
+    def mark_complete_many(self, request_ids: List[str]) -> None:
+        """Mark several requests as complete under a single lock acquisition"""
+        with self.lock:
+            for request_id in request_ids:
+                self.active_requests.pop(request_id, None)
+    
+    def reset(self) -> None:
+        """Drop all queued and active requests and reset the counter"""
+        with self.lock:
+            while True:
+                try:
+                    self.request_queue.get_nowait()
+                except Empty:
+                    break
+            self.active_requests.clear()
+            self.request_counter = 0
+    
     def get_queue_size(self) -> int:
         """Get current queue size"""
         return self.request_queue.qsize()
     
     def get_active_count(self) -> int:
         """Get number of active requests"""
-        with self.lock:
-            return len(self.active_requests)
+        # len() of a dict is atomic under the GIL, no lock needed for reads
+        return len(self.active_requests)
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get request handler statistics"""
+        """Get request handler statistics, read together under the lock"""
         with self.lock:
             return {
                 'queue_size': self.request_queue.qsize(),
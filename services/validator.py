@@ -2,9 +2,35 @@
 Input validation service for generation requests
 """
 import logging
+import numpy as np
+from typing import NamedTuple, Optional, Tuple, FrozenSet
 
 logger = logging.getLogger(__name__)
 
+_INT64_MIN, _INT64_MAX = int(np.iinfo(np.int64).min), int(np.iinfo(np.int64).max)
+
+
+class ValidationResult(NamedTuple):
+    """Outcome of a single validate() call"""
+    valid: bool
+    data: Optional[dict] = None
+    errors: Tuple[str, ...] = ()
+    error_codes: FrozenSet[str] = frozenset()
+
+
+class FieldRule(NamedTuple):
+    """Checks for one required numeric request field, with the error code for each"""
+    key: str
+    types: object
+    minimum: float
+    maximum: float
+    step: Optional[int]
+    missing_code: str
+    type_code: str
+    range_code: str
+    step_code: Optional[str]
+
+
 class InputValidator:
     """Validates generation request parameters"""
     
@@ -18,17 +44,50 @@ class InputValidator:
     MAX_LENGTH = 500
     LENGTH_STEP = 10
     
+    # Error codes and their messages, formatted once at import
+    ERROR_MESSAGES = {
+        'SEED_NOT_STRING': 'Seed must be a string',
+        'SEED_TOO_LONG': f'Seed must be at most {MAX_SEED_LENGTH} characters',
+        'TEMP_REQUIRED': 'Temperature is required',
+        'TEMP_NOT_NUMBER': 'Temperature must be a number',
+        'TEMP_OUT_OF_RANGE': f'Temperature must be between {MIN_TEMPERATURE} and {MAX_TEMPERATURE}',
+        'LENGTH_REQUIRED': 'Length is required',
+        'LENGTH_NOT_INTEGER': 'Length must be an integer',
+        'LENGTH_OUT_OF_RANGE': f'Length must be between {MIN_LENGTH} and {MAX_LENGTH}',
+        'LENGTH_NOT_MULTIPLE': f'Length must be a multiple of {LENGTH_STEP}',
+    }
+    
+    # Required numeric fields and their checks
+    NUMERIC_FIELDS = (
+        FieldRule(
+            key='temperature', types=(int, float),
+            minimum=MIN_TEMPERATURE, maximum=MAX_TEMPERATURE, step=None,
+            missing_code='TEMP_REQUIRED', type_code='TEMP_NOT_NUMBER',
+            range_code='TEMP_OUT_OF_RANGE', step_code=None
+        ),
+        FieldRule(
+            key='length', types=int,
+            minimum=MIN_LENGTH, maximum=MAX_LENGTH, step=LENGTH_STEP,
+            missing_code='LENGTH_REQUIRED', type_code='LENGTH_NOT_INTEGER',
+            range_code='LENGTH_OUT_OF_RANGE', step_code='LENGTH_NOT_MULTIPLE'
+        ),
+    )
+    
     def validate(self, data):
         """
         Validate generation request parameters
         
+        Values are copied out of data as they are checked, and no reference to
+        data is kept, so callers may reuse the same dictionary between calls.
+        
         Args:
             data: Dictionary with 'seed', 'temperature', 'length' keys
         
         Returns:
-            Dictionary with 'valid' (bool), 'data' (dict), and 'errors' (list)
+            ValidationResult with valid, data (None when invalid), errors
+            (tuple of messages) and error_codes (frozenset of ERROR_MESSAGES keys)
         """
-        errors = []
+        codes = []
         validated_data = {}
         
         # Validate seed (optional)
@@ -37,9 +96,9 @@ class InputValidator:
             seed = ''
         
         if not isinstance(seed, str):
-            errors.append('Seed must be a string')
+            codes.append('SEED_NOT_STRING')
         elif len(seed) > self.MAX_SEED_LENGTH:
-            errors.append(f'Seed must be at most {self.MAX_SEED_LENGTH} characters')
+            codes.append('SEED_TOO_LONG')
         
         # Use default seed if empty
         if seed == '':
@@ -47,38 +106,88 @@ class InputValidator:
         
         validated_data['seed'] = seed
         
-        # Validate temperature (required)
-        if 'temperature' not in data:
-            errors.append('Temperature is required')
-        else:
-            temperature = data.get('temperature')
-            
-            if not isinstance(temperature, (int, float)):
-                errors.append('Temperature must be a number')
-            elif temperature < self.MIN_TEMPERATURE or temperature > self.MAX_TEMPERATURE:
-                errors.append(f'Temperature must be between {self.MIN_TEMPERATURE} and {self.MAX_TEMPERATURE}')
-            else:
-                # Round to nearest step (0.1)
-                rounded = round(temperature * 10) / 10
-                validated_data['temperature'] = round(rounded, 1)
-        
-        # Validate length (required)
-        if 'length' not in data:
-            errors.append('Length is required')
-        else:
-            length = data.get('length')
+        # Validate required numeric fields against the table above
+        for rule in self.NUMERIC_FIELDS:
+            if rule.key not in data:
+                codes.append(rule.missing_code)
+                continue
             
-            if not isinstance(length, int):
-                errors.append('Length must be an integer')
-            elif length < self.MIN_LENGTH or length > self.MAX_LENGTH:
-                errors.append(f'Length must be between {self.MIN_LENGTH} and {self.MAX_LENGTH}')
-            elif length % self.LENGTH_STEP != 0:
-                errors.append(f'Length must be a multiple of {self.LENGTH_STEP}')
+            value = data[rule.key]
+            if not isinstance(value, rule.types):
+                codes.append(rule.type_code)
+            elif value < rule.minimum or value > rule.maximum:
+                codes.append(rule.range_code)
+            elif rule.step is not None and value % rule.step != 0:
+                codes.append(rule.step_code)
             else:
-                validated_data['length'] = length
+                validated_data[rule.key] = value
+        
+        # Round temperature to nearest step (0.1) in integer tenths; round()
+        # returns an int here and int / 10 is already the nearest float, so no
+        # second rounding pass is needed. Ties stay half-to-even (1.05 -> 1.0).
+        if 'temperature' in validated_data:
+            validated_data['temperature'] = round(validated_data['temperature'] * 10) / 10
+        
+        if not codes:
+            return ValidationResult(True, validated_data)
+        
+        return ValidationResult(
+            False,
+            errors=tuple(self.ERROR_MESSAGES[code] for code in codes),
+            error_codes=frozenset(codes)
+        )
+    
+    def validate_batch(self, temperatures, lengths, seed_lengths=None):
+        """
+        Check many numeric parameter sets at once with vectorized comparisons
+        
+        Applies the same range and step rules as validate() element-wise,
+        without building per-request results or error messages. Python values
+        follow validate()'s type rules, except that NumPy integers (and, for
+        temperatures, NumPy floats) are accepted like their Python
+        counterparts; validate() only ever sees JSON-decoded values.
+        
+        Args:
+            temperatures: Sequence of temperatures
+            lengths: Sequence of integer lengths, same size as temperatures
+            seed_lengths: Optional sequence of seed lengths to check as well
+        
+        Returns:
+            Boolean numpy array, True where the parameter set is valid
+        """
+        t, t_ok = self._numeric_column(
+            temperatures, (int, float, np.integer, np.floating), 'biuf')
+        n, n_ok = self._numeric_column(lengths, (int, np.integer), 'biu')
+        t = t.astype(np.float64)
+        n = n.astype(np.int64)
+        ok = (t_ok & (t >= self.MIN_TEMPERATURE) & (t <= self.MAX_TEMPERATURE)
+              & n_ok & (n >= self.MIN_LENGTH) & (n <= self.MAX_LENGTH)
+              & (n % self.LENGTH_STEP == 0))
+        if seed_lengths is not None:
+            ok &= np.asarray(seed_lengths, dtype=np.int64) <= self.MAX_SEED_LENGTH
+        return ok
+    
+    @staticmethod
+    def _numeric_column(values, types, kinds):
+        """
+        Convert values to an array, masking entries validate() would reject by type
+        
+        Args:
+            values: Sequence of request values
+            types: Python types validate() accepts for the field
+            kinds: NumPy dtype kinds that only hold acceptable values
+        
+        Returns:
+            Tuple of (array with rejected entries replaced by 0, boolean mask)
+        """
+        column = np.asarray(values)
+        if column.dtype.kind in kinds:
+            return column, np.ones(column.shape, dtype=np.bool_)
         
-        return {
-            'valid': len(errors) == 0,
-            'data': validated_data if len(errors) == 0 else {},
-            'errors': errors
-        }
+        # Mixed or mistyped input (e.g. a float length): check each entry.
+        # Ints too large for int64 are far outside every range, so reject them
+        # here rather than let the array conversion overflow.
+        ok = np.array([isinstance(value, types)
+                       and not (isinstance(value, int) and not _INT64_MIN <= value <= _INT64_MAX)
+                       for value in values], dtype=np.bool_)
+        return np.array([value if accepted else 0 for value, accepted in zip(values, ok)]), ok
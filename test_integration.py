@@ -23,11 +23,11 @@ def test_full_pipeline():
     print("\n[Test 1] Input Validation")
     test_input = {'seed': '', 'temperature': 1.0, 'length': 200}
     validation = validator.validate(test_input)
-    assert validation['valid'], "Validation failed"
+    assert validation.valid, "Validation failed"
     print(f"✓ Input validation passed")
-    print(f"  - Seed: {validation['data']['seed'][:30]}...")
-    print(f"  - Temperature: {validation['data']['temperature']}")
-    print(f"  - Length: {validation['data']['length']}")
+    print(f"  - Seed: {validation.data['seed'][:30]}...")
+    print(f"  - Temperature: {validation.data['temperature']}")
+    print(f"  - Length: {validation.data['length']}")
     
     # Test 2: Music Generation
     print("\n[Test 2] Music Generation")
@@ -0,0 +1,35 @@
+"""
+Shared pytest fixtures and Hypothesis profiles
+"""
+import os
+import pytest
+from hypothesis import settings, Phase
+from services.validator import InputValidator
+
+# Deterministic, database-free runs for CI; tests with explicit settings keep their budgets
+settings.register_profile(
+    'ci',
+    derandomize=True,
+    max_examples=25,
+    database=None,
+    phases=(Phase.explicit, Phase.generate)
+)
+
+if os.getenv('CI'):
+    settings.load_profile('ci')
+
+
+@pytest.fixture(scope='session')
+def client():
+    """Create a test client shared by the whole session"""
+    # Imported lazily so test modules that never use the client don't load the model
+    from app import app
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture(scope='session')
+def validator():
+    """Create one input validator shared by the whole session"""
+    return InputValidator()
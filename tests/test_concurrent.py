@@ -3,22 +3,31 @@ Property-based tests for concurrent request handling
 Feature: music-generation-gui, Property 28: Concurrent Request Safety
 Validates: Requirements 5.5
 """
+import atexit
 import pytest
-import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from hypothesis import given, strategies as st, settings, HealthCheck
-from app import app
 from services.request_handler import RequestHandler
 
 request_handler = RequestHandler()
 
+# Worker pool reused across Hypothesis examples instead of spawning threads each time
+_POOL = ThreadPoolExecutor(max_workers=5)
+atexit.register(_POOL.shutdown)
+
+
+@pytest.fixture(scope='session')
+def shared_handler():
+    """Create one request handler for the whole session"""
+    return RequestHandler()
+
 
 @pytest.fixture
-def client():
-    """Create a test client"""
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
+def handler(shared_handler):
+    """Provide the shared request handler, reset after each test"""
+    yield shared_handler
+    shared_handler.reset()
 
 
 class TestConcurrentRequests:
@@ -30,33 +39,28 @@ class TestConcurrentRequests:
         assert handler.get_queue_size() == 0
         assert handler.get_active_count() == 0
 
-    def test_queue_request(self):
+    def test_queue_request(self, handler):
         """Test queuing a request"""
-        handler = RequestHandler()
         result = handler.queue_request('req1', {'seed': 'X:1', 'temperature': 1.0, 'length': 250})
         assert result is True
         assert handler.get_queue_size() == 1
 
-    def test_mark_processing(self):
+    def test_mark_processing(self, handler):
         """Test marking request as processing"""
-        handler = RequestHandler()
         handler.queue_request('req1', {'seed': 'X:1', 'temperature': 1.0, 'length': 250})
         handler.mark_processing('req1')
         stats = handler.get_stats()
         assert stats['active_requests'] == 1
 
-    def test_mark_complete(self):
+    def test_mark_complete(self, handler):
         """Test marking request as complete"""
-        handler = RequestHandler()
         handler.queue_request('req1', {'seed': 'X:1', 'temperature': 1.0, 'length': 250})
         handler.mark_processing('req1')
         handler.mark_complete('req1')
         assert handler.get_active_count() == 0
 
-    def test_multiple_concurrent_requests(self):
+    def test_multiple_concurrent_requests(self, handler):
         """Test handling multiple concurrent requests"""
-        handler = RequestHandler()
-        
         # Queue multiple requests
         for i in range(5):
             result = handler.queue_request(f'req{i}', {
@@ -68,19 +72,27 @@ class TestConcurrentRequests:
         
         assert handler.get_queue_size() == 5
 
-    def test_request_isolation(self):
+    def test_queue_requests_batch_stops_when_full(self):
+        """Test that batch queuing stops at the queue limit"""
+        handler = RequestHandler(max_queue_size=2)
+        result = handler.queue_requests_batch([
+            (f'req{i}', {'seed': 'X:1', 'temperature': 1.0, 'length': 250})
+            for i in range(3)
+        ])
+        assert result == 2
+        assert handler.get_queue_size() == 2
+        assert handler.get_active_count() == 2
+
+    def test_request_isolation(self, handler):
         """Test that concurrent requests don't share state"""
-        handler = RequestHandler()
-        
         # Queue requests with different parameters
         handler.queue_request('req1', {'seed': 'seed1', 'temperature': 0.5, 'length': 100})
         handler.queue_request('req2', {'seed': 'seed2', 'temperature': 1.5, 'length': 300})
         
-        # Verify both are queued
-        assert handler.get_queue_size() == 2
-        
-        # Both should be active after queuing
-        assert handler.get_active_count() == 2
+        # Verify both are queued and active after queuing
+        stats = handler.get_stats()
+        assert stats['queue_size'] == 2
+        assert stats['active_requests'] == 2
         
         # Complete first
         handler.mark_complete('req1')
@@ -98,21 +110,20 @@ class TestConcurrentRequestsProperties:
         num_requests=st.integers(min_value=1, max_value=10)
     )
     @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=20)
-    def test_multiple_requests_queued_safely(self, num_requests):
+    def test_multiple_requests_queued_safely(self, shared_handler, num_requests):
         """
         Property 28: Concurrent Request Safety
         For any number of concurrent requests, all SHALL be queued without data corruption
         """
-        handler = RequestHandler()
+        handler = shared_handler
+        handler.reset()
         
         # Queue multiple requests
-        for i in range(num_requests):
-            result = handler.queue_request(f'req{i}', {
-                'seed': f'seed{i}',
-                'temperature': 1.0,
-                'length': 250
-            })
-            assert result is True
+        requests = [
+            (f'req{i}', {'seed': f'seed{i}', 'temperature': 1.0, 'length': 250})
+            for i in range(num_requests)
+        ]
+        assert handler.queue_requests_batch(requests) == num_requests
         
         # Verify all queued
         assert handler.get_queue_size() == num_requests
@@ -121,25 +132,24 @@ class TestConcurrentRequestsProperties:
         num_requests=st.integers(min_value=1, max_value=10)
     )
     @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=20)
-    def test_concurrent_processing_no_interference(self, num_requests):
+    def test_concurrent_processing_no_interference(self, shared_handler, num_requests):
         """For any number of concurrent requests, processing SHALL not interfere"""
-        handler = RequestHandler()
+        handler = shared_handler
+        handler.reset()
         
         # Queue and process requests
+        handler.queue_requests_batch([
+            (f'req{i}', {'seed': f'seed{i}', 'temperature': 1.0, 'length': 250})
+            for i in range(num_requests)
+        ])
         for i in range(num_requests):
-            handler.queue_request(f'req{i}', {
-                'seed': f'seed{i}',
-                'temperature': 1.0,
-                'length': 250
-            })
             handler.mark_processing(f'req{i}')
         
         # All should be active
         assert handler.get_active_count() == num_requests
         
         # Complete all
-        for i in range(num_requests):
-            handler.mark_complete(f'req{i}')
+        handler.mark_complete_many([f'req{i}' for i in range(num_requests)])
         
         # All should be complete
         assert handler.get_active_count() == 0
@@ -148,10 +158,12 @@ class TestConcurrentRequestsProperties:
         num_threads=st.integers(min_value=2, max_value=5)
     )
     @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=10)
-    def test_thread_safe_concurrent_operations(self, num_threads):
+    def test_thread_safe_concurrent_operations(self, shared_handler, num_threads):
         """For any number of concurrent threads, operations SHALL be thread-safe"""
-        handler = RequestHandler()
-        errors = []
+        handler = shared_handler
+        handler.reset()
+        # One slot per worker so threads never append to a shared list
+        errors = [None] * num_threads
         
         def worker(thread_id):
             try:
@@ -165,19 +177,12 @@ class TestConcurrentRequestsProperties:
                     handler.mark_processing(req_id)
                     handler.mark_complete(req_id)
             except Exception as e:
-                errors.append(str(e))
-        
-        # Create and start threads
-        threads = []
-        for i in range(num_threads):
-            t = threading.Thread(target=worker, args=(i,))
-            threads.append(t)
-            t.start()
+                errors[thread_id] = str(e)
         
-        # Wait for all threads
-        for t in threads:
-            t.join()
+        # Submit workers to the pool and wait for all of them
+        futures = [_POOL.submit(worker, i) for i in range(num_threads)]
+        wait(futures)
         
         # Verify no errors
-        assert len(errors) == 0
+        assert all(error is None for error in errors)
         assert handler.get_active_count() == 0
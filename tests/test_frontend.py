@@ -3,17 +3,46 @@ Property-based tests for frontend functionality
 Feature: music-generation-gui
 Validates: Requirements 1.3, 1.4, 1.5, 1.6
 """
+import re
 import pytest
+from dataclasses import dataclass
+from datetime import datetime
 from hypothesis import given, strategies as st, settings, HealthCheck
 
+# Strategies shared by the property tests; lengths are built as multiples of
+# ten directly rather than filtered, so no examples are rejected
+SEED_STRAT = st.text(max_size=50)
+TEMP_STRAT = st.floats(min_value=0.1, max_value=2.0)
+LENGTH_STRAT = st.integers(min_value=5, max_value=50).map(lambda x: x * 10)
+
+# Download filename format: music_<ISO timestamp with ':' replaced by '-'>.abc
+_FILENAME_RE = re.compile(r'music_\d{4}-\d{2}-\d{2}T\d{2}-\d{2}-\d{2}\.abc')
+
+
+@dataclass(frozen=True)
+class GenParams:
+    """Generation request parameters in the format the frontend sends them"""
+    
+    # Explicit slots rather than slots=True, which needs Python 3.10
+    __slots__ = ('seed', 'temperature', 'length')
+    
+    seed: str
+    temperature: float
+    length: int
+    
+    def __post_init__(self):
+        if not (isinstance(self.seed, str) and len(self.seed) <= 50):
+            raise ValueError(f'Invalid seed: {self.seed!r}')
+        if not (isinstance(self.temperature, float) and 0.1 <= self.temperature <= 2.0):
+            raise ValueError(f'Invalid temperature: {self.temperature!r}')
+        if not (isinstance(self.length, int) and 50 <= self.length <= 500):
+            raise ValueError(f'Invalid length: {self.length!r}')
+
 
 class TestFrontendProperties:
     """Property-based tests for frontend functionality"""
 
-    @given(
-        temperature=st.floats(min_value=0.1, max_value=2.0)
-    )
-    @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=50)
+    @pytest.mark.parametrize('temperature', [0.1, 0.5, 1.0, 1.5, 2.0])
     def test_temperature_display_accuracy(self, temperature):
         """
         Property 2: Temperature Display Accuracy
@@ -28,9 +57,9 @@ class TestFrontendProperties:
         assert isinstance(rounded_temp, float)
 
     @given(
-        length=st.integers(min_value=50, max_value=500).filter(lambda x: x % 10 == 0)
+        length=LENGTH_STRAT
     )
-    @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=50)
+    @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=10, derandomize=True)
     def test_sequence_length_display_accuracy(self, length):
         """
         Property 3: Sequence Length Display Accuracy
@@ -43,9 +72,9 @@ class TestFrontendProperties:
         assert isinstance(length, int)
 
     @given(
-        seed=st.text(max_size=50),
-        temperature=st.floats(min_value=0.1, max_value=2.0),
-        length=st.integers(min_value=50, max_value=500).filter(lambda x: x % 10 == 0)
+        seed=SEED_STRAT,
+        temperature=TEMP_STRAT,
+        length=LENGTH_STRAT
     )
     @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=50)
     def test_generation_request_parameters(self, seed, temperature, length):
@@ -54,19 +83,15 @@ class TestFrontendProperties:
         For any generation request, the frontend SHALL send all parameters in correct format
         Validates: Requirements 1.5
         """
-        # Verify parameters are in correct format
-        params = {
-            'seed': seed,
-            'temperature': temperature,
-            'length': length
-        }
-        
-        assert isinstance(params['seed'], str)
-        assert isinstance(params['temperature'], float)
-        assert isinstance(params['length'], int)
-        assert 0.1 <= params['temperature'] <= 2.0
-        assert 50 <= params['length'] <= 500
-        assert len(params['seed']) <= 50
+        # Verify parameters are in correct format; GenParams raises otherwise
+        GenParams(seed, temperature, length)
+
+    def test_generation_request_parameters_rejects_bad_format(self):
+        """Test that out-of-range or mistyped parameters fail the format check"""
+        with pytest.raises(ValueError):
+            GenParams('X:1', 1, 250)
+        with pytest.raises(ValueError):
+            GenParams('X:1', 1.0, 501)
 
     def test_loading_state_during_generation(self):
         """
@@ -96,9 +121,7 @@ class TestFrontendProperties:
             }
         }
         
-        assert 'notation' in response
-        assert 'timestamp' in response
-        assert 'parameters' in response
+        assert response.keys() >= {'notation', 'timestamp', 'parameters'}
         assert isinstance(response['notation'], str)
         assert len(response['notation']) > 0
 
@@ -165,16 +188,13 @@ class TestFrontendProperties:
         Validates: Requirements 2.5
         """
         # Test filename generation
-        import re
-        from datetime import datetime
-        
         timestamp = datetime.now().isoformat().replace(':', '-').split('.')[0]
         filename = f'music_{timestamp}.abc'
         
         # Verify filename format
         assert filename.startswith('music_')
         assert filename.endswith('.abc')
-        assert re.match(r'music_\d{4}-\d{2}-\d{2}T\d{2}-\d{2}-\d{2}\.abc', filename)
+        assert _FILENAME_RE.match(filename)
 
     def test_generation_history_addition(self):
         """
@@ -193,9 +213,7 @@ class TestFrontendProperties:
             'isFavorite': False
         }
         
-        assert 'id' in history_item
-        assert 'notation' in history_item
-        assert 'timestamp' in history_item
+        assert history_item.keys() >= {'id', 'notation', 'timestamp'}
         assert history_item['isFavorite'] is False
 
     def test_history_display_limit(self):
@@ -266,8 +284,7 @@ class TestFrontendProperties:
             'range': '0.1 to 2.0'
         }
         
-        assert 'title' in tooltip
-        assert 'description' in tooltip
+        assert tooltip.keys() >= {'title', 'description'}
         assert len(tooltip['description']) > 0
 
     def test_visual_feedback_on_actions(self):
@@ -310,8 +327,7 @@ class TestFrontendProperties:
             ]
         }
         
-        assert 'theme' in stored_data
-        assert 'favorites' in stored_data
+        assert stored_data.keys() >= {'theme', 'favorites'}
         assert isinstance(stored_data['favorites'], list)
 
     def test_storage_quota_management(self):
@@ -344,7 +360,5 @@ class TestFrontendProperties:
             ]
         }
         
-        assert 'version' in export_data
-        assert 'exportDate' in export_data
-        assert 'favorites' in export_data
+        assert export_data.keys() >= {'version', 'exportDate', 'favorites'}
         assert isinstance(export_data['favorites'], list)
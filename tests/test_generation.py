@@ -6,19 +6,52 @@ Validates: Requirements 5.1, 5.3
 """
 import pytest
 import json
+import struct
+from unittest.mock import patch
 from hypothesis import given, strategies as st, settings, HealthCheck
 from app import app
-from services.validator import InputValidator
 
-validator = InputValidator()
+# Strategies shared by the property tests; lengths are built as multiples of
+# ten directly rather than filtered, so no examples are rejected
+SEED_STRAT = st.text(max_size=50)
+TEMP_STRAT = st.floats(min_value=0.1, max_value=2.0)
+LENGTH_STRAT = st.integers(min_value=5, max_value=50).map(lambda x: x * 10)
 
 
-@pytest.fixture(scope='session')
-def client():
-    """Create a test client"""
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
+def _f32(value):
+    """Round value to the nearest 32-bit float, as width=32 strategy bounds require"""
+    return struct.unpack('f', struct.pack('f', value))[0]
+
+
+# Out-of-range temperatures: finite 32-bit floats in a bounded band on either
+# side, since NaN, infinities and huge magnitudes are all rejected the same way
+LOW_TEMP_STRAT = st.floats(min_value=-100.0, max_value=_f32(0.09),
+                           allow_nan=False, allow_infinity=False, width=32)
+HIGH_TEMP_STRAT = st.floats(min_value=_f32(2.01), max_value=100.0,
+                            allow_nan=False, allow_infinity=False, width=32)
+
+# Valid request body; property tests override one field per example
+_BASE = {'seed': 'X:1', 'temperature': 1.0, 'length': 250}
+
+# The same request pre-encoded, posted as a raw body by the unit tests
+_VALID_BODY = json.dumps(_BASE).encode()
+
+# Notation returned in place of model output where only the HTTP contract is tested
+_CANNED_NOTATION = "X:1\nM:4/4\nL:1/8\nC D E F G A B c"
+
+
+def _assert_error(response, code=400):
+    """Assert that the response is an API error with the given status code"""
+    assert response.status_code == code
+    assert b'"error"' in response.data
+
+
+@pytest.fixture(scope='class')
+def stub_inference():
+    """Replace model inference with canned notation for the duration of a class"""
+    generator = app.extensions['music']['generator']
+    with patch.object(generator, '_generate_with_model', return_value=_CANNED_NOTATION):
+        yield
 
 
 class TestGenerationAPI:
@@ -26,16 +59,10 @@ class TestGenerationAPI:
 
     def test_generate_with_valid_parameters(self, client):
         """Test generation with valid parameters"""
-        response = client.post('/api/generate', json={
-            'seed': 'X:1',
-            'temperature': 1.0,
-            'length': 250
-        })
+        response = client.post('/api/generate', data=_VALID_BODY, content_type='application/json')
         assert response.status_code == 200
         data = response.get_json()
-        assert 'notation' in data
-        assert 'timestamp' in data
-        assert 'parameters' in data
+        assert data.keys() >= {'notation', 'timestamp', 'parameters'}
         assert isinstance(data['notation'], str)
 
     def test_generate_with_empty_seed(self, client):
@@ -66,9 +93,7 @@ class TestGenerationAPI:
             'temperature': 0.05,
             'length': 250
         })
-        assert response.status_code == 400
-        data = response.get_json()
-        assert 'error' in data
+        _assert_error(response)
 
     def test_generate_with_invalid_length(self, client):
         """Test generation with invalid length returns 400"""
@@ -77,9 +102,7 @@ class TestGenerationAPI:
             'temperature': 1.0,
             'length': 40
         })
-        assert response.status_code == 400
-        data = response.get_json()
-        assert 'error' in data
+        _assert_error(response)
 
     def test_generate_with_missing_temperature(self, client):
         """Test generation with missing temperature returns 400"""
@@ -87,9 +110,7 @@ class TestGenerationAPI:
             'seed': 'X:1',
             'length': 250
         })
-        assert response.status_code == 400
-        data = response.get_json()
-        assert 'error' in data
+        _assert_error(response)
 
     def test_generate_with_missing_length(self, client):
         """Test generation with missing length returns 400"""
@@ -97,32 +118,31 @@ class TestGenerationAPI:
             'seed': 'X:1',
             'temperature': 1.0
         })
-        assert response.status_code == 400
-        data = response.get_json()
-        assert 'error' in data
+        _assert_error(response)
 
     def test_health_endpoint(self, client):
         """Test health check endpoint"""
         response = client.get('/api/health')
         assert response.status_code == 200
         data = response.get_json()
-        assert 'status' in data
-        assert 'model_loaded' in data
+        assert data.keys() >= {'status', 'model_loaded'}
 
 
 class TestGenerationAPIProperties:
     """Property-based tests for generation API"""
 
     @given(
-        seed=st.text(max_size=50),
-        temperature=st.floats(min_value=0.1, max_value=2.0),
-        length=st.integers(min_value=50, max_value=500).filter(lambda x: x % 10 == 0)
+        seed=SEED_STRAT,
+        temperature=TEMP_STRAT,
+        length=LENGTH_STRAT
     )
-    @settings(suppress_health_check=[HealthCheck.too_slow, HealthCheck.function_scoped_fixture], max_examples=20, deadline=3000)
-    def test_valid_generation_returns_200(self, client, seed, temperature, length):
+    @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=20, deadline=500)
+    def test_valid_generation_returns_200(self, client, stub_inference, seed, temperature, length):
         """
         Property 24: Backend Generation Functionality
         For any valid generation request, backend SHALL return 200 with notation
+        
+        Model inference is stubbed; the unit tests above exercise the real model.
         """
         response = client.post('/api/generate', json={
             'seed': seed,
@@ -131,86 +151,62 @@ class TestGenerationAPIProperties:
         })
         assert response.status_code == 200
         data = response.get_json()
-        assert 'notation' in data
+        assert data.keys() >= {'notation', 'timestamp', 'parameters'}
         assert isinstance(data['notation'], str)
         assert len(data['notation']) > 0
-        assert 'timestamp' in data
-        assert 'parameters' in data
 
     @given(
         seed=st.text(min_size=51, max_size=100)
     )
-    @settings(suppress_health_check=[HealthCheck.too_slow, HealthCheck.function_scoped_fixture], max_examples=20)
-    def test_long_seed_returns_400(self, client, seed):
+    @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=20)
+    def test_long_seed_rejected(self, validator, seed):
         """
         Property 26: Invalid Parameter Error Response
-        For any request with invalid seed, backend SHALL return 400
+        For any request with invalid seed, validation SHALL fail
+        
+        Invalid-parameter properties call the validator directly; the route's
+        400 response is covered by the unit tests above.
         """
-        response = client.post('/api/generate', json={
-            'seed': seed,
-            'temperature': 1.0,
-            'length': 250
-        })
-        assert response.status_code == 400
-        data = response.get_json()
-        assert 'error' in data
+        result = validator.validate(_BASE | {'seed': seed})
+        assert not result.valid
+        assert result.errors
 
     @given(
-        temperature=st.floats(max_value=0.09)
+        temperature=LOW_TEMP_STRAT
     )
-    @settings(suppress_health_check=[HealthCheck.too_slow, HealthCheck.function_scoped_fixture], max_examples=20)
-    def test_low_temperature_returns_400(self, client, temperature):
-        """For any request with temperature below minimum, backend SHALL return 400"""
-        response = client.post('/api/generate', json={
-            'seed': 'X:1',
-            'temperature': temperature,
-            'length': 250
-        })
-        assert response.status_code == 400
-        data = response.get_json()
-        assert 'error' in data
+    @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=20)
+    def test_low_temperature_rejected(self, validator, temperature):
+        """For any request with temperature below minimum, validation SHALL fail"""
+        result = validator.validate(_BASE | {'temperature': temperature})
+        assert not result.valid
+        assert result.errors
 
     @given(
-        temperature=st.floats(min_value=2.01)
+        temperature=HIGH_TEMP_STRAT
     )
-    @settings(suppress_health_check=[HealthCheck.too_slow, HealthCheck.function_scoped_fixture], max_examples=20)
-    def test_high_temperature_returns_400(self, client, temperature):
-        """For any request with temperature above maximum, backend SHALL return 400"""
-        response = client.post('/api/generate', json={
-            'seed': 'X:1',
-            'temperature': temperature,
-            'length': 250
-        })
-        assert response.status_code == 400
-        data = response.get_json()
-        assert 'error' in data
+    @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=20)
+    def test_high_temperature_rejected(self, validator, temperature):
+        """For any request with temperature above maximum, validation SHALL fail"""
+        result = validator.validate(_BASE | {'temperature': temperature})
+        assert not result.valid
+        assert result.errors
 
     @given(
         length=st.integers(max_value=49)
     )
-    @settings(suppress_health_check=[HealthCheck.too_slow, HealthCheck.function_scoped_fixture], max_examples=20)
-    def test_short_length_returns_400(self, client, length):
-        """For any request with length below minimum, backend SHALL return 400"""
-        response = client.post('/api/generate', json={
-            'seed': 'X:1',
-            'temperature': 1.0,
-            'length': length
-        })
-        assert response.status_code == 400
-        data = response.get_json()
-        assert 'error' in data
+    @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=20)
+    def test_short_length_rejected(self, validator, length):
+        """For any request with length below minimum, validation SHALL fail"""
+        result = validator.validate(_BASE | {'length': length})
+        assert not result.valid
+        assert result.errors
 
     @given(
         length=st.integers(min_value=501)
     )
-    @settings(suppress_health_check=[HealthCheck.too_slow, HealthCheck.function_scoped_fixture], max_examples=20)
-    def test_long_length_returns_400(self, client, length):
-        """For any request with length above maximum, backend SHALL return 400"""
-        response = client.post('/api/generate', json={
-            'seed': 'X:1',
-            'temperature': 1.0,
-            'length': length
-        })
-        assert response.status_code == 400
-        data = response.get_json()
-        assert 'error' in data
+    @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=20)
+    def test_long_length_rejected(self, validator, length):
+        """For any request with length above maximum, validation SHALL fail"""
+        result = validator.validate(_BASE | {'length': length})
+        assert not result.valid
+        assert result.errors
@@ -3,229 +3,179 @@ Property-based tests for input validation
 Feature: music-generation-gui, Property 25: Input Parameter Validation
 Validates: Requirements 5.2
 """
+import numpy as np
 import pytest
+from types import MappingProxyType
 from hypothesis import given, strategies as st, settings, HealthCheck
 from services.validator import InputValidator
 
-validator = InputValidator()
+# Valid request parameters; unit cases override or drop single fields
+_BASE_PARAMS = MappingProxyType({'seed': 'X:1', 'temperature': 1.0, 'length': 250})
+
+# Request dict reused by the rejection and property tests; validate() never keeps a reference to it
+_PAYLOAD = dict(_BASE_PARAMS)
+
+# Printable ASCII for seeds; an explicit alphabet keeps st.text on its simple path
+_SEED_ALPHABET = st.characters(min_codepoint=32, max_codepoint=126)
+
+# Seed one character over the limit
+_LONG_SEED = 'x' * (InputValidator.MAX_SEED_LENGTH + 1)
+
+
+def _without(key):
+    """Copy of the base parameters with one field missing"""
+    return {name: value for name, value in _BASE_PARAMS.items() if name != key}
+
+
+# Unit cases: (id, request, expected error code or None if valid, expected validated data)
+CASES = [
+    ('valid_parameters', dict(_BASE_PARAMS), None, {'seed': 'X:1', 'temperature': 1.0, 'length': 250}),
+    ('empty_seed_uses_default', {**_BASE_PARAMS, 'seed': ''}, None, {'seed': InputValidator.DEFAULT_SEED}),
+    ('missing_seed_uses_default', _without('seed'), None, {'seed': InputValidator.DEFAULT_SEED}),
+    ('seed_too_long', {**_BASE_PARAMS, 'seed': _LONG_SEED}, 'SEED_TOO_LONG', None),
+    ('temperature_too_low', {**_BASE_PARAMS, 'temperature': 0.05}, 'TEMP_OUT_OF_RANGE', None),
+    ('temperature_too_high', {**_BASE_PARAMS, 'temperature': 2.5}, 'TEMP_OUT_OF_RANGE', None),
+    ('length_too_short', {**_BASE_PARAMS, 'length': 40}, 'LENGTH_OUT_OF_RANGE', None),
+    ('length_too_long', {**_BASE_PARAMS, 'length': 600}, 'LENGTH_OUT_OF_RANGE', None),
+    ('length_not_multiple_of_step', {**_BASE_PARAMS, 'length': 255}, 'LENGTH_NOT_MULTIPLE', None),
+    ('missing_temperature', _without('temperature'), 'TEMP_REQUIRED', None),
+    ('missing_length', _without('length'), 'LENGTH_REQUIRED', None),
+    # 1.05 rounds to 1.0 (nearest 0.1)
+    ('temperature_rounding', {**_BASE_PARAMS, 'temperature': 1.05}, None, {'temperature': 1.0}),
+]
 
 
 class TestInputValidation:
     """Unit tests for input validation"""
 
-    def test_valid_parameters(self):
-        """Test validation with valid parameters"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'temperature': 1.0,
-            'length': 250
-        })
-        assert result['valid'] is True
-        assert result['data']['seed'] == 'X:1'
-        assert result['data']['temperature'] == 1.0
-        assert result['data']['length'] == 250
-
-    def test_empty_seed_uses_default(self):
-        """Test that empty seed uses default"""
-        result = validator.validate({
-            'seed': '',
-            'temperature': 1.0,
-            'length': 250
-        })
-        assert result['valid'] is True
-        assert result['data']['seed'] == validator.DEFAULT_SEED
-
-    def test_missing_seed_uses_default(self):
-        """Test that missing seed uses default"""
-        result = validator.validate({
-            'temperature': 1.0,
-            'length': 250
-        })
-        assert result['valid'] is True
-        assert result['data']['seed'] == validator.DEFAULT_SEED
-
-    def test_seed_too_long(self):
-        """Test that seed exceeding max length is rejected"""
-        result = validator.validate({
-            'seed': 'x' * 51,
-            'temperature': 1.0,
-            'length': 250
-        })
-        assert result['valid'] is False
-        assert any('Seed must be at most' in error for error in result['errors'])
-
-    def test_temperature_too_low(self):
-        """Test that temperature below minimum is rejected"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'temperature': 0.05,
-            'length': 250
-        })
-        assert result['valid'] is False
-        assert any('Temperature must be between' in error for error in result['errors'])
-
-    def test_temperature_too_high(self):
-        """Test that temperature above maximum is rejected"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'temperature': 2.5,
-            'length': 250
-        })
-        assert result['valid'] is False
-        assert any('Temperature must be between' in error for error in result['errors'])
-
-    def test_length_too_short(self):
-        """Test that length below minimum is rejected"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'temperature': 1.0,
-            'length': 40
-        })
-        assert result['valid'] is False
-        assert any('Length must be between' in error for error in result['errors'])
-
-    def test_length_too_long(self):
-        """Test that length above maximum is rejected"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'temperature': 1.0,
-            'length': 600
-        })
-        assert result['valid'] is False
-        assert any('Length must be between' in error for error in result['errors'])
-
-    def test_length_not_multiple_of_step(self):
-        """Test that length not multiple of 10 is rejected"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'temperature': 1.0,
-            'length': 255
-        })
-        assert result['valid'] is False
-        assert any('Length must be a multiple of' in error for error in result['errors'])
-
-    def test_missing_temperature(self):
-        """Test that missing temperature is rejected"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'length': 250
-        })
-        assert result['valid'] is False
-        assert any('Temperature is required' in error for error in result['errors'])
-
-    def test_missing_length(self):
-        """Test that missing length is rejected"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'temperature': 1.0
-        })
-        assert result['valid'] is False
-        assert any('Length is required' in error for error in result['errors'])
-
-    def test_temperature_rounding(self):
-        """Test that temperature is rounded to nearest 0.1"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'temperature': 1.05,
-            'length': 250
-        })
-        assert result['valid'] is True
-        # 1.05 rounds to 1.0 (nearest 0.1)
-        assert result['data']['temperature'] == 1.0
+    @pytest.mark.parametrize('case', CASES, ids=[case[0] for case in CASES])
+    def test_validate(self, validator, case):
+        """Test validation of one request against its expected outcome"""
+        _, params, error, expected_data = case
+        result = validator.validate(params)
+        if error is None:
+            assert result.valid is True
+            for key, value in expected_data.items():
+                assert result.data[key] == value
+        else:
+            assert result.valid is False
+            assert error in result.error_codes
+            assert InputValidator.ERROR_MESSAGES[error] in result.errors
+
+    def test_validate_batch_seed_lengths(self, validator):
+        """Test that batch validation rejects rows whose seed is too long"""
+        max_seed = InputValidator.MAX_SEED_LENGTH
+        ok = validator.validate_batch([1.0] * 3, [250] * 3, seed_lengths=[0, max_seed, max_seed + 1])
+        assert ok.tolist() == [True, True, False]
+
+    def test_validate_batch_numpy_values(self, validator):
+        """Test that batch validation accepts NumPy numbers like Python ones"""
+        ok = validator.validate_batch([np.float32(1.0), 1.0], [np.int64(250), 250.0])
+        assert ok.tolist() == [True, False]
+        assert validator.validate_batch(np.array([1.0]), np.array([250])).tolist() == [True]
 
 
 class TestInputValidationProperties:
     """Property-based tests for input validation"""
 
     @given(
-        seed=st.text(max_size=50),
+        seed=st.text(alphabet=_SEED_ALPHABET, max_size=50),
         temperature=st.floats(min_value=0.1, max_value=2.0),
-        length=st.integers(min_value=50, max_value=500).filter(lambda x: x % 10 == 0)
+        length=st.integers(min_value=5, max_value=50).map(lambda x: x * 10)
     )
-    @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=50)
-    def test_valid_parameters_always_pass(self, seed, temperature, length):
+    @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=50, database=None)
+    def test_valid_parameters_always_pass(self, validator, seed, temperature, length):
         """
         Property 25: Input Parameter Validation
         For any valid parameters within range, validation SHALL pass
         """
-        result = validator.validate({
-            'seed': seed,
-            'temperature': temperature,
-            'length': length
-        })
-        assert result['valid'] is True
-        assert 'data' in result
-        assert result['data']['temperature'] is not None
-        assert result['data']['length'] is not None
+        _PAYLOAD.update(seed=seed, temperature=temperature, length=length)
+        result = validator.validate(_PAYLOAD)
+        assert result.valid is True
+        assert result.data is not None
+        assert result.data['temperature'] is not None
+        assert result.data['length'] is not None
 
     @given(
-        seed=st.text(min_size=51, max_size=100)
+        params=st.lists(
+            st.tuples(
+                st.floats(min_value=0.1, max_value=2.0),
+                st.integers(min_value=5, max_value=50).map(lambda x: x * 10)
+            ),
+            min_size=64,
+            max_size=256
+        )
     )
-    def test_long_seed_always_fails(self, seed):
-        """For any seed exceeding max length, validation SHALL fail"""
-        result = validator.validate({
-            'seed': seed,
-            'temperature': 1.0,
-            'length': 250
-        })
-        assert result['valid'] is False
+    @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=20, database=None)
+    def test_batch_valid_parameters(self, validator, params):
+        """For any batch of valid numeric parameters, batch validation SHALL pass every row"""
+        temperatures, lengths = zip(*params)
+        assert validator.validate_batch(temperatures, lengths).all()
 
     @given(
-        temperature=st.floats(max_value=0.09)
+        params=st.lists(
+            st.tuples(
+                st.floats(min_value=-1.0, max_value=3.0),
+                st.one_of(
+                    st.integers(min_value=0, max_value=600),
+                    # Float lengths, including whole multiples of the step
+                    st.integers(min_value=0, max_value=60).map(lambda x: x * 10.0),
+                    st.floats(min_value=0.0, max_value=600.0),
+                    # Ints beyond int64 must be rejected, not overflow
+                    st.integers(min_value=2 ** 63)
+                )
+            ),
+            min_size=1,
+            max_size=64
+        )
     )
-    def test_low_temperature_always_fails(self, temperature):
+    @settings(suppress_health_check=[HealthCheck.too_slow], max_examples=20, database=None)
+    def test_batch_matches_validate(self, validator, params):
+        """Batch validation SHALL agree with validate() row by row"""
+        temperatures, lengths = zip(*params)
+        batch = validator.validate_batch(temperatures, lengths)
+        for ok, (temperature, length) in zip(batch, params):
+            _PAYLOAD.update(_BASE_PARAMS, temperature=temperature, length=length)
+            assert bool(ok) is validator.validate(_PAYLOAD).valid
+
+    @pytest.mark.parametrize('seed', [_LONG_SEED, 'x' * 100, 'X:1\n' * 20])
+    def test_long_seed_always_fails(self, validator, seed):
+        """For any seed exceeding max length, validation SHALL fail"""
+        _PAYLOAD.update(_BASE_PARAMS, seed=seed)
+        result = validator.validate(_PAYLOAD)
+        assert result.valid is False
+
+    @pytest.mark.parametrize('temperature', [0.09, 0.05, 0.0, -1.0, float('-inf')])
+    def test_low_temperature_always_fails(self, validator, temperature):
         """For any temperature below minimum, validation SHALL fail"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'temperature': temperature,
-            'length': 250
-        })
-        assert result['valid'] is False
+        _PAYLOAD.update(_BASE_PARAMS, temperature=temperature)
+        result = validator.validate(_PAYLOAD)
+        assert result.valid is False
 
-    @given(
-        temperature=st.floats(min_value=2.01)
-    )
-    def test_high_temperature_always_fails(self, temperature):
+    @pytest.mark.parametrize('temperature', [2.01, 2.5, 10.0, 1e308, float('inf')])
+    def test_high_temperature_always_fails(self, validator, temperature):
         """For any temperature above maximum, validation SHALL fail"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'temperature': temperature,
-            'length': 250
-        })
-        assert result['valid'] is False
+        _PAYLOAD.update(_BASE_PARAMS, temperature=temperature)
+        result = validator.validate(_PAYLOAD)
+        assert result.valid is False
 
-    @given(
-        length=st.integers(max_value=49)
-    )
-    def test_short_length_always_fails(self, length):
+    @pytest.mark.parametrize('length', [49, 40, 0, -1, -10 ** 9])
+    def test_short_length_always_fails(self, validator, length):
         """For any length below minimum, validation SHALL fail"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'temperature': 1.0,
-            'length': length
-        })
-        assert result['valid'] is False
+        _PAYLOAD.update(_BASE_PARAMS, length=length)
+        result = validator.validate(_PAYLOAD)
+        assert result.valid is False
 
-    @given(
-        length=st.integers(min_value=501)
-    )
-    def test_long_length_always_fails(self, length):
+    @pytest.mark.parametrize('length', [501, 510, 600, 10 ** 9])
+    def test_long_length_always_fails(self, validator, length):
         """For any length above maximum, validation SHALL fail"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'temperature': 1.0,
-            'length': length
-        })
-        assert result['valid'] is False
+        _PAYLOAD.update(_BASE_PARAMS, length=length)
+        result = validator.validate(_PAYLOAD)
+        assert result.valid is False
 
-    @given(
-        length=st.integers(min_value=50, max_value=500).filter(lambda x: x % 10 != 0)
-    )
-    def test_non_step_length_always_fails(self, length):
+    @pytest.mark.parametrize('length', [51, 59, 255, 491, 499])
+    def test_non_step_length_always_fails(self, validator, length):
         """For any length not multiple of 10, validation SHALL fail"""
-        result = validator.validate({
-            'seed': 'X:1',
-            'temperature': 1.0,
-            'length': length
-        })
-        assert result['valid'] is False
+        _PAYLOAD.update(_BASE_PARAMS, length=length)
+        result = validator.validate(_PAYLOAD)
+        assert result.valid is False